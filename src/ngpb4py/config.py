@@ -237,9 +237,11 @@ class NgpbConfig:
         """Return a copy with selected option values overridden."""
         merged = dict(self.data)
         merged.update(updates)
+        # The schema is never mutated after construction, so derived configs
+        # can share it instead of copying the full option table per update.
         return NgpbConfig(
             data=merged,
-            schema=dict(self.schema),
+            schema=self.schema,
             source_prm_path=self.source_prm_path,
             source_dir=self.source_dir,
             explicit_keys=self.explicit_keys | set(updates),
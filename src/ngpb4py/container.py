@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import shutil
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -16,6 +17,8 @@ from .helpers.run_container import (
 
 _LOGGER = logging.getLogger(__name__)
 
+_OUTPUT_CANDIDATE_NAMES = ("phi_surf.txt", "phi_nodes.txt", "phi_on_atoms.txt")
+
 
 @dataclass
 class ExecutionResult:
@@ -41,34 +44,40 @@ class ContainerBackend:
     extra_args: list[str] | None = None
     exec_args: list[str] | None = None
     stream_output: bool = False
+    _runtime_cmd: str | None = field(default=None, init=False, repr=False)
+    _resolved_image: tuple[str, str] | None = field(default=None, init=False, repr=False)
 
     def run(
         self, prm_f: Path, workdir: Path, nproc: int, ngpb_binary: str, collect_version: bool = True
     ) -> ExecutionResult:
         """Run the configured container backend and collect execution artefacts."""
-        runtime_cmd = detect_runtime(self.apptainer_path)
-        resolved_image = prepare_container_image("apptainer", self.image)
-
-        mount_arg = f"{workdir}:/App"
-        base_cmd = [
+        if self._runtime_cmd is None:
+            self._runtime_cmd = detect_runtime(self.apptainer_path)
+        runtime_cmd = self._runtime_cmd
+        if self._resolved_image is None or self._resolved_image[0] != self.image:
+            self._resolved_image = (self.image, prepare_container_image("apptainer", self.image))
+        resolved_image = self._resolved_image[1]
+
+        command = [
             runtime_cmd,
+            *(self.extra_args or ()),
             "exec",
-            *(self.exec_args or []),
+            *(self.exec_args or ()),
             "--pwd",
             "/App",
             "--bind",
-            mount_arg,
+            f"{workdir}:/App",
             resolved_image,
             "mpirun",
             "-np",
             str(nproc),
+            ngpb_binary,
+            "--prmfile",
+            str(prm_f),
         ]
 
-        command = base_cmd + [ngpb_binary, "--prmfile", str(prm_f)]
-        if self.extra_args:
-            command[1:1] = self.extra_args
-
-        _LOGGER.debug("Execution command: %s\n", " ".join(command))
+        command_str = " ".join(command)
+        _LOGGER.debug("Execution command: %s\n", command_str)
 
         stdout_path = workdir / "ngpb.stdout.log"
         stderr_path = workdir / "ngpb.stderr.log"
@@ -81,11 +90,7 @@ class ContainerBackend:
         )
 
         digest = container_digest(resolved_image)
-        candidates = [
-            workdir / "phi_surf.txt",
-            workdir / "phi_nodes.txt",
-            workdir / "phi_on_atoms.txt",
-        ]
+        candidates = [workdir / name for name in _OUTPUT_CANDIDATE_NAMES]
         existing_outputs = [path for path in candidates if path.exists()]
         return ExecutionResult(
             command=command,
@@ -94,7 +99,7 @@ class ContainerBackend:
             output_paths=existing_outputs,
             container_digest=digest,
             provenance=_collect_provenance(
-                command=command,
+                command_str=command_str,
                 nproc=nproc,
                 backend_name=self.name,
                 container_digest=digest,
@@ -105,7 +110,7 @@ class ContainerBackend:
 
 
 def _collect_provenance(
-    command: list[str],
+    command_str: str,
     nproc: int,
     backend_name: str,
     container_digest: str | None,
@@ -113,7 +118,7 @@ def _collect_provenance(
     collect_version: bool = True,
 ) -> dict[str, str]:
     """Collect reproducibility metadata for a backend execution."""
-    provenance = {"backend": backend_name, "nproc": str(nproc), "command": " ".join(command)}
+    provenance = {"backend": backend_name, "nproc": str(nproc), "command": command_str}
     if container_digest:
         provenance["container_digest"] = container_digest
     if collect_version:
@@ -123,8 +128,22 @@ def _collect_provenance(
     return provenance
 
 
+_NGPB_VERSION_CACHE: dict[str, str | None] = {}
+
+
 def _detect_ngpb_version(ngpb_binary: str) -> str | None:
     """Best-effort detection of the local NextGenPB binary version."""
+    if ngpb_binary not in _NGPB_VERSION_CACHE:
+        _NGPB_VERSION_CACHE[ngpb_binary] = _probe_ngpb_version(ngpb_binary)
+    return _NGPB_VERSION_CACHE[ngpb_binary]
+
+
+def _probe_ngpb_version(ngpb_binary: str) -> str | None:
+    """Run the version probe for a binary, returning None when unavailable."""
+    # The binary usually only exists inside the container; a PATH probe is
+    # much cheaper than spawning a process just to fail with ENOENT.
+    if not Path(ngpb_binary).is_absolute() and shutil.which(ngpb_binary) is None:
+        return None
     try:
         output = subprocess.check_output([ngpb_binary, "--version"], stderr=subprocess.STDOUT)
         return output.decode(errors="replace").strip().splitlines()[0]
@@ -1,5 +1,6 @@
 """Utilities for preparing and running the containerized solver backend."""
 
+import hashlib
 import os
 import shutil
 import subprocess
@@ -10,12 +11,15 @@ from urllib.parse import urlparse
 
 from ngpb4py.helpers.download_image import download_cached_image
 
+_REMOTE_SCHEMES = frozenset({"http", "https"})
+
 
 def prepare_container_image(runtime: str, image: str) -> str:
     """Resolve a container image path, downloading remote Apptainer images if needed."""
     if runtime != "apptainer":
         return image
-    if not is_remote_image(image):
+    parsed = urlparse(image)
+    if parsed.scheme.lower() not in _REMOTE_SCHEMES:
         return image
 
     cache_dir = Path(
@@ -23,12 +27,14 @@ def prepare_container_image(runtime: str, image: str) -> str:
     ).expanduser()
     cache_dir.mkdir(parents=True, exist_ok=True)
 
-    parsed = urlparse(image)
     file_name = Path(parsed.path).name or "container.sif"
     destination = cache_dir / file_name
 
-    if destination.exists() and destination.stat().st_size > 0:
-        return str(destination)
+    try:
+        if os.stat(destination).st_size > 0:
+            return str(destination)
+    except OSError:
+        pass
 
     download_cached_image(image, destination)
     return str(destination)
@@ -37,7 +43,7 @@ def prepare_container_image(runtime: str, image: str) -> str:
 def is_remote_image(image: str) -> bool:
     """Return whether a container image reference points to HTTP(S)."""
     scheme = urlparse(image).scheme.lower()
-    return scheme in {"http", "https"}
+    return scheme in _REMOTE_SCHEMES
 
 
 def detect_runtime(apptainer_path: str | None = None) -> str:
@@ -69,6 +75,9 @@ def execute_command(
         stdout_path.open("w", encoding="utf-8") as stdout_file,
         stderr_path.open("w", encoding="utf-8") as stderr_file,
     ):
+        # Never add preexec_fn (or uid/gid/umask overrides) here: they force
+        # CPython off its vfork() fast path onto plain fork(), which copies
+        # the driver process's page tables for every solver launch.
         completed = subprocess.run(
             command, cwd=workdir, stdout=stdout_file, stderr=stderr_file, check=False
         )
@@ -111,18 +120,36 @@ def stream_pipe(pipe, destination_file, destination_stream) -> None:
     if pipe is None:
         return
     for line in pipe:
+        # Only the terminal stream is flushed per line for live feedback; the
+        # log file keeps its block buffering and is flushed when closed.
         destination_file.write(line)
-        destination_file.flush()
         destination_stream.write(line)
         destination_stream.flush()
 
 
+_DIGEST_CACHE: dict[tuple[str, int, int], str] = {}
+
+
 def container_digest(image: str) -> str | None:
     """Return the SHA-256 digest for a local container image when available."""
     try:
-        if Path(image).exists():
-            output = subprocess.check_output(["sha256sum", image], stderr=subprocess.DEVNULL)
-            return output.decode(errors="replace").split()[0]
-    except Exception:
+        image_stat = os.stat(image)
+    except OSError:
+        return None
+
+    # Images are multi-hundred-megabyte files that rarely change, so digests
+    # are cached per (path, size, mtime) instead of re-hashed on every run.
+    cache_key = (image, image_stat.st_size, image_stat.st_mtime_ns)
+    cached = _DIGEST_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    try:
+        with open(image, "rb") as image_file:
+            for block in iter(lambda: image_file.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
         return None
-    return None
+    _DIGEST_CACHE[cache_key] = digest.hexdigest()
+    return _DIGEST_CACHE[cache_key]
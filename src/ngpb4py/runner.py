@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 import shutil
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from os import PathLike
 from pathlib import Path
 from typing import Any
@@ -31,6 +31,8 @@ class NgpbRunner:
     container_extra_args: list[str] | None = None
     container_exec_args: list[str] | None = None
     verbosity: int = 3
+    _backend: ContainerBackend | None = field(default=None, init=False, repr=False)
+    _backend_settings: tuple | None = field(default=None, init=False, repr=False)
 
     def run(
         self,
@@ -60,13 +62,25 @@ class NgpbRunner:
         input_paths = [str(prm_path), *(str(path) for path in staged_paths.values())]
         _LOGGER.debug("Input paths: %s", ", ".join(input_paths))
 
-        _LOGGER.debug("Creating container backend with image=%s", self.container_image)
-        backend = ContainerBackend(
-            image=self.container_image,
-            apptainer_path=self.apptainer_path,
-            extra_args=self.container_extra_args,
-            exec_args=self.container_exec_args,
+        # Reusing the backend across runs preserves its cached runtime lookup
+        # and resolved image, but only while the container settings still
+        # match; changing any of them rebuilds the backend on the next run.
+        backend_settings = (
+            self.container_image,
+            self.apptainer_path,
+            tuple(self.container_extra_args or ()),
+            tuple(self.container_exec_args or ()),
         )
+        if self._backend is None or self._backend_settings != backend_settings:
+            _LOGGER.debug("Creating container backend with image=%s", self.container_image)
+            self._backend = ContainerBackend(
+                image=self.container_image,
+                apptainer_path=self.apptainer_path,
+                extra_args=self.container_extra_args,
+                exec_args=self.container_exec_args,
+            )
+            self._backend_settings = backend_settings
+        backend = self._backend
 
         backend.stream_output = effective_verbose >= 3
         _LOGGER.info("Running backend %s with %d process(es)", backend.name, self.nproc)
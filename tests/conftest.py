@@ -0,0 +1,20 @@
+"""Shared pytest fixtures for the ngpb4py test suite."""
+
+import logging
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _quiet_package_logging():
+    """Keep package log records off the root logger during tests.
+
+    _configure_logging only disables propagation when it installs its own
+    handler, so tests that attach handlers first would otherwise pay for
+    every record being formatted a second time by the root logger.
+    """
+    logger = logging.getLogger("ngpb4py")
+    saved_propagate = logger.propagate
+    logger.propagate = False
+    yield
+    logger.propagate = saved_propagate
@@ -1,4 +1,5 @@
 import io
+import shutil
 import subprocess
 import threading
 import time
@@ -8,23 +9,48 @@ import pytest
 from ngpb4py.container import ContainerBackend
 from ngpb4py.helpers.run_container import detect_runtime
 
+LOCAL_IMAGE = "/tmp/NextGenPB.sif"
+REMOTE_IMAGE = "https://example.org/NextGenPB.sif"
 
-def test_detect_runtime_uses_apptainer_from_path(monkeypatch):
+
+def make_fake_run(captured, returncode=0):
+    def fake_run(command, cwd, stdout, stderr, check):
+        captured["command"] = command
+        return subprocess.CompletedProcess(command, returncode)
+
+    return fake_run
+
+
+@pytest.fixture(scope="session")
+def prmfile(tmp_path_factory):
+    path = tmp_path_factory.mktemp("prm") / "ngpb.prm"
+    path.write_text("solver.max_iterations = 1\n")
+    return path
+
+
+@pytest.fixture
+def captured_run(monkeypatch):
+    captured = {}
+    monkeypatch.setattr(subprocess, "run", make_fake_run(captured))
+    return captured
+
+
+@pytest.fixture
+def apptainer_on_path(monkeypatch):
     monkeypatch.setattr(
-        "shutil.which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
+        shutil, "which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
     )
 
+
+def test_detect_runtime_uses_apptainer_from_path(apptainer_on_path):
     assert detect_runtime() == "/usr/bin/apptainer"
 
 
-def test_detect_runtime_uses_custom_absolute_apptainer_path(tmp_path, monkeypatch):
-    custom_apptainer = tmp_path / "bin" / "apptainer"
-    custom_apptainer.parent.mkdir()
-    custom_apptainer.write_text("#!/bin/sh\n")
-    custom_apptainer.chmod(custom_apptainer.stat().st_mode | 0o111)
-    monkeypatch.setattr("shutil.which", lambda name: None)
+def test_detect_runtime_uses_custom_absolute_apptainer_path(monkeypatch):
+    custom_apptainer = "/opt/apptainer/bin/apptainer"
+    monkeypatch.setattr(shutil, "which", lambda name: None)
 
-    assert detect_runtime(str(custom_apptainer)) == str(custom_apptainer)
+    assert detect_runtime(custom_apptainer) == custom_apptainer
 
 
 def test_detect_runtime_rejects_non_absolute_apptainer_path():
@@ -33,57 +59,35 @@ def test_detect_runtime_rejects_non_absolute_apptainer_path():
 
 
 def test_detect_runtime_raises_when_apptainer_missing(monkeypatch):
-    monkeypatch.setattr("shutil.which", lambda name: None)
+    monkeypatch.setattr(shutil, "which", lambda name: None)
 
     with pytest.raises(RuntimeError, match="Apptainer runtime was not found in PATH"):
         detect_runtime()
 
 
-def test_container_command_building(tmp_path, monkeypatch):
-    prmfile = tmp_path / "ngpb.prm"
-    prmfile.write_text("solver.max_iterations = 1\n")
-
-    captured = {}
-
-    def fake_run(command, cwd, stdout, stderr, check):
-        captured["command"] = command
-        return subprocess.CompletedProcess(command, 0)
-
-    def fake_check_output(command, stderr=None):
-        del stderr
-        return b"sha256:dummy local-image"
+def test_container_command_building(apptainer_on_path, prmfile, tmp_path, captured_run):
+    backend = ContainerBackend(image=LOCAL_IMAGE)
+    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb", collect_version=False)
 
-    monkeypatch.setattr("subprocess.run", fake_run)
-    monkeypatch.setattr("subprocess.check_output", fake_check_output)
-    monkeypatch.setattr(
-        "shutil.which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
-    )
-
-    backend = ContainerBackend(image="/tmp/NextGenPB.sif")
-    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb")
-
-    assert captured["command"][0:11] == [
+    assert captured_run["command"][0:11] == [
         "/usr/bin/apptainer",
         "exec",
         "--pwd",
         "/App",
         "--bind",
         f"{tmp_path}:/App",
-        "/tmp/NextGenPB.sif",
+        LOCAL_IMAGE,
         "mpirun",
         "-np",
         "1",
         "ngpb",
     ]
-    assert captured["command"][-2:] == ["--prmfile", str(prmfile)]
+    assert captured_run["command"][-2:] == ["--prmfile", str(prmfile)]
 
 
-def test_apptainer_remote_image_download_with_progress(tmp_path, monkeypatch):
+def test_download_with_progress_renders_progress_bar(tmp_path, monkeypatch):
     from ngpb4py.helpers import download_image
 
-    prmfile = tmp_path / "ngpb.prm"
-    prmfile.write_text("solver.max_iterations = 1\n")
-
     class FakeResponse:
         def __init__(self):
             self.headers = {"Content-Length": "10"}
@@ -104,62 +108,50 @@ def test_apptainer_remote_image_download_with_progress(tmp_path, monkeypatch):
         def isatty(self):
             return True
 
-    captured = {}
     fake_stderr = FakeStderr()
-
-    def fake_urlopen(url):
-        captured["url"] = url
-        return FakeResponse()
-
-    def fake_run(command, cwd, stdout, stderr, check):
-        captured["command"] = command
-        return subprocess.CompletedProcess(command, 0)
-
-    monkeypatch.setenv("NGPB_CONTAINER_CACHE_DIR", str(tmp_path / "cache"))
-    monkeypatch.setattr(download_image, "urlopen", fake_urlopen)
+    monkeypatch.setattr(download_image, "urlopen", lambda url: FakeResponse())
     monkeypatch.setattr(download_image.sys, "stderr", fake_stderr)
-    monkeypatch.setattr("subprocess.run", fake_run)
-    monkeypatch.setattr(
-        "subprocess.check_output", lambda command, stderr=None: b"sha256:dummy local-image"
-    )
-    monkeypatch.setattr(
-        "shutil.which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
-    )
 
-    backend = ContainerBackend(image="https://example.org/NextGenPB.sif")
-    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb")
+    destination = tmp_path / "NextGenPB.sif"
+    download_image.download_with_progress(REMOTE_IMAGE, destination)
 
-    local_image = tmp_path / "cache" / "NextGenPB.sif"
-    assert captured["url"] == "https://example.org/NextGenPB.sif"
-    assert str(local_image) in captured["command"]
-    assert local_image.exists()
+    assert destination.read_bytes() == b"1234567890"
     assert "Downloading container image" in fake_stderr.getvalue()
     assert "100%" in fake_stderr.getvalue()
 
 
-def test_apptainer_exec_args_are_inserted_after_exec(tmp_path, monkeypatch):
-    prmfile = tmp_path / "ngpb.prm"
-    prmfile.write_text("solver.max_iterations = 1\n")
+def test_apptainer_remote_image_is_downloaded_to_cache(
+    apptainer_on_path, prmfile, tmp_path, monkeypatch
+):
+    from ngpb4py.helpers import run_container
 
     captured = {}
 
-    def fake_run(command, cwd, stdout, stderr, check):
-        captured["command"] = command
-        return subprocess.CompletedProcess(command, 0)
+    def fake_download(url, destination):
+        captured["url"] = url
+        destination.write_bytes(b"image")
 
-    monkeypatch.setattr("subprocess.run", fake_run)
-    monkeypatch.setattr(
-        "subprocess.check_output", lambda command, stderr=None: b"sha256:dummy local-image"
-    )
-    monkeypatch.setattr(
-        "shutil.which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
-    )
+    monkeypatch.setenv("NGPB_CONTAINER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(run_container, "download_cached_image", fake_download)
+    monkeypatch.setattr(subprocess, "run", make_fake_run(captured))
 
-    backend = ContainerBackend(image="/tmp/NextGenPB.sif", exec_args=["--nv", "--containall"])
-    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=2, ngpb_binary="ngpb")
+    backend = ContainerBackend(image=REMOTE_IMAGE)
+    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb")
+
+    local_image = tmp_path / "cache" / "NextGenPB.sif"
+    assert captured["url"] == REMOTE_IMAGE
+    assert str(local_image) in captured["command"]
+    assert local_image.exists()
 
-    assert captured["command"][0].endswith("apptainer")
-    assert captured["command"][1:12] == [
+
+def test_apptainer_exec_args_are_inserted_after_exec(
+    apptainer_on_path, prmfile, tmp_path, captured_run
+):
+    backend = ContainerBackend(image=LOCAL_IMAGE, exec_args=["--nv", "--containall"])
+    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=2, ngpb_binary="ngpb", collect_version=False)
+
+    assert captured_run["command"][0].endswith("apptainer")
+    assert captured_run["command"][1:12] == [
         "exec",
         "--nv",
         "--containall",
@@ -167,58 +159,37 @@ def test_apptainer_exec_args_are_inserted_after_exec(tmp_path, monkeypatch):
         "/App",
         "--bind",
         f"{tmp_path}:/App",
-        "/tmp/NextGenPB.sif",
+        LOCAL_IMAGE,
         "mpirun",
         "-np",
         "2",
     ]
 
 
-def test_apptainer_uses_custom_absolute_path_when_not_on_path(tmp_path, monkeypatch):
-    prmfile = tmp_path / "ngpb.prm"
-    prmfile.write_text("solver.max_iterations = 1\n")
+def test_apptainer_uses_custom_absolute_path_when_not_on_path(
+    prmfile, tmp_path, captured_run, monkeypatch
+):
+    custom_apptainer = "/opt/apptainer/bin/apptainer"
 
-    custom_apptainer = tmp_path / "bin" / "apptainer"
-    custom_apptainer.parent.mkdir()
-    custom_apptainer.write_text("#!/bin/sh\n")
-    custom_apptainer.chmod(custom_apptainer.stat().st_mode | 0o111)
+    monkeypatch.setattr(shutil, "which", lambda name: None)
 
-    captured = {}
-
-    def fake_run(command, cwd, stdout, stderr, check):
-        captured["command"] = command
-        return subprocess.CompletedProcess(command, 0)
-
-    monkeypatch.setattr("subprocess.run", fake_run)
-    monkeypatch.setattr("shutil.which", lambda name: None)
-
-    backend = ContainerBackend(apptainer_path=str(custom_apptainer), image="/tmp/NextGenPB.sif")
-    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb")
+    backend = ContainerBackend(apptainer_path=custom_apptainer, image=LOCAL_IMAGE)
+    backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb", collect_version=False)
 
-    assert captured["command"][0] == str(custom_apptainer)
-    assert captured["command"][1] == "exec"
+    assert captured_run["command"][0] == custom_apptainer
+    assert captured_run["command"][1] == "exec"
 
 
-def test_container_run_raises_on_nonzero_exit(tmp_path, monkeypatch):
-    prmfile = tmp_path / "ngpb.prm"
-    prmfile.write_text("solver.max_iterations = 1\n")
+def test_container_run_raises_on_nonzero_exit(apptainer_on_path, prmfile, tmp_path, monkeypatch):
+    monkeypatch.setattr(subprocess, "run", make_fake_run({}, returncode=7))
 
-    def fake_run(command, cwd, stdout, stderr, check):
-        return subprocess.CompletedProcess(command, 7)
-
-    monkeypatch.setattr("subprocess.run", fake_run)
-    monkeypatch.setattr(
-        "shutil.which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
-    )
-
-    backend = ContainerBackend(image="/tmp/NextGenPB.sif")
+    backend = ContainerBackend(image=LOCAL_IMAGE)
     with pytest.raises(subprocess.CalledProcessError, match="returned non-zero exit status 7"):
         backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb")
 
 
-def test_streaming_container_run_raises_on_nonzero_exit(tmp_path, monkeypatch):
-    prmfile = tmp_path / "ngpb.prm"
-    prmfile.write_text("solver.max_iterations = 1\n")
+def test_streaming_execution_raises_on_nonzero_exit(tmp_path, monkeypatch):
+    from ngpb4py.helpers import run_container
 
     class FakeProcess:
         def __init__(self):
@@ -228,14 +199,12 @@ def test_streaming_container_run_raises_on_nonzero_exit(tmp_path, monkeypatch):
         def wait(self):
             return 9
 
-    monkeypatch.setattr("subprocess.Popen", lambda *args, **kwargs: FakeProcess())
-    monkeypatch.setattr(
-        "shutil.which", lambda name: "/usr/bin/apptainer" if name == "apptainer" else None
-    )
+    monkeypatch.setattr(subprocess, "Popen", lambda *args, **kwargs: FakeProcess())
 
-    backend = ContainerBackend(image="/tmp/NextGenPB.sif", stream_output=True)
     with pytest.raises(subprocess.CalledProcessError, match="returned non-zero exit status 9"):
-        backend.run(prm_f=prmfile, workdir=tmp_path, nproc=1, ngpb_binary="ngpb")
+        run_container.execute_command_streaming(
+            ["ngpb"], tmp_path, tmp_path / "ngpb.stdout.log", tmp_path / "ngpb.stderr.log"
+        )
 
 
 def test_apptainer_remote_image_download_is_locked(tmp_path, monkeypatch):
@@ -259,12 +228,10 @@ def test_apptainer_remote_image_download_is_locked(tmp_path, monkeypatch):
     monkeypatch.setattr(download_image, "download_with_progress", fake_download)
 
     thread_one = threading.Thread(
-        target=container_backend.prepare_container_image,
-        args=("apptainer", "https://example.org/NextGenPB.sif"),
+        target=container_backend.prepare_container_image, args=("apptainer", REMOTE_IMAGE)
     )
     thread_two = threading.Thread(
-        target=container_backend.prepare_container_image,
-        args=("apptainer", "https://example.org/NextGenPB.sif"),
+        target=container_backend.prepare_container_image, args=("apptainer", REMOTE_IMAGE)
     )
 
     thread_one.start()
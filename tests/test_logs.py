@@ -1,13 +1,18 @@
 from pathlib import Path
 
+import pytest
+
 from ngpb4py.io.logs import parse_log
 from ngpb4py.result import NgpbResult
 
 
-def test_parse_log_sections():
-    text = Path("tests/data/sample.log").read_text()
+@pytest.fixture(scope="session")
+def sample_log_text():
+    return Path("tests/data/sample.log").read_text()
+
 
-    parsed = parse_log(text)
+def test_parse_log_sections(sample_log_text):
+    parsed = parse_log(sample_log_text)
 
     assert parsed.section_count() == 6
     assert parsed.system is not None
@@ -103,11 +108,10 @@ def test_parse_log_ignores_unknown_lines_within_sections():
     assert parsed.grid.total_nodes is None
 
 
-def test_ngpb_result_from_logs_exposes_structured_log(tmp_path):
+def test_ngpb_result_from_logs_exposes_structured_log(tmp_path, sample_log_text):
     stdout_path = tmp_path / "stdout.log"
     stderr_path = tmp_path / "stderr.log"
-    stdout_text = Path("tests/data/sample.log").read_text()
-    stdout_path.write_text(stdout_text)
+    stdout_path.write_text(sample_log_text)
     stderr_path.write_text("")
 
     result = NgpbResult.from_logs(
@@ -256,63 +256,44 @@ def test_exercise1_prm_load():
     assert loaded["calc_coulombic"] == 1
 
 
-def test_exercise4_fine_mesh_prm_load():
-    prm_path = Path("examples/exercise4/fine_mesh.prm")
-    loaded = load_prm(str(prm_path))
-
-    assert loaded["filetype"] == "pdb"
-    assert loaded["filename"] == "1CCM.pdb"
-    assert loaded["radius_file"] == "radius.siz"
-    assert loaded["charge_file"] == "charge.crg"
-    assert loaded["write_pqr"] == 1
-    assert loaded["name_pqr"] == "1CCM_out.pqr"
-    assert loaded["mesh_shape"] == 0
-    assert loaded["perfil1"] == 0.95
-    assert loaded["perfil2"] == 0.2
-    assert loaded["scale"] == 4.0
-    assert loaded["map_type"] == "vtu"
-    assert loaded["potential_map"] == 1
-
-
-def test_exercise4_rand_center_prm_load():
-    prm_path = Path("examples/exercise4/rand_center.prm")
-    loaded = load_prm(str(prm_path))
-
-    assert loaded["filetype"] == "pdb"
-    assert loaded["filename"] == "1CCM.pdb"
-    assert loaded["radius_file"] == "radius.siz"
-    assert loaded["charge_file"] == "charge.crg"
-    assert loaded["write_pqr"] == 1
-    assert loaded["name_pqr"] == "1CCM_out.pqr"
-    assert loaded["mesh_shape"] == 0
-    assert loaded["perfil1"] == 0.95
-    assert loaded["perfil2"] == 0.2
-    assert loaded["scale"] == 2.0
-    assert loaded["rand_center"] == 1
-    assert loaded["map_type"] == "vtu"
-    assert loaded["potential_map"] == 1
+_EXERCISE4_COMMON_VALUES = {
+    "filetype": "pdb",
+    "filename": "1CCM.pdb",
+    "radius_file": "radius.siz",
+    "charge_file": "charge.crg",
+    "write_pqr": 1,
+    "name_pqr": "1CCM_out.pqr",
+    "perfil2": 0.2,
+    "map_type": "vtu",
+    "potential_map": 1,
+}
 
 
-def test_exercise4_focus_prm_load():
-    prm_path = Path("examples/exercise4/focus.prm")
+@pytest.mark.parametrize(
+    ("variant", "expected_values"),
+    [
+        ("fine_mesh", {"mesh_shape": 0, "perfil1": 0.95, "scale": 4.0}),
+        ("rand_center", {"mesh_shape": 0, "perfil1": 0.95, "scale": 2.0, "rand_center": 1}),
+        (
+            "focus",
+            {
+                "mesh_shape": 3,
+                "perfil1": 0.9,
+                "scale": 2.0,
+                "cx_foc": 1,
+                "cy_foc": 10,
+                "cz_foc": 5,
+                "n_grid": 50,
+            },
+        ),
+    ],
+)
+def test_exercise4_prm_load(variant, expected_values):
+    prm_path = Path("examples/exercise4") / f"{variant}.prm"
     loaded = load_prm(str(prm_path))
 
-    assert loaded["filetype"] == "pdb"
-    assert loaded["filename"] == "1CCM.pdb"
-    assert loaded["radius_file"] == "radius.siz"
-    assert loaded["charge_file"] == "charge.crg"
-    assert loaded["write_pqr"] == 1
-    assert loaded["name_pqr"] == "1CCM_out.pqr"
-    assert loaded["mesh_shape"] == 3
-    assert loaded["perfil1"] == 0.9
-    assert loaded["perfil2"] == 0.2
-    assert loaded["scale"] == 2.0
-    assert loaded["cx_foc"] == 1
-    assert loaded["cy_foc"] == 10
-    assert loaded["cz_foc"] == 5
-    assert loaded["n_grid"] == 50
-    assert loaded["map_type"] == "vtu"
-    assert loaded["potential_map"] == 1
+    for key, value in (_EXERCISE4_COMMON_VALUES | expected_values).items():
+        assert loaded[key] == value
 
 
 def test_exercise_prm_files_validate_against_documented_schema():
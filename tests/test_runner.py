@@ -1,10 +1,21 @@
+import logging
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 
 from ngpb4py import NgpbConfig, NgpbRunner
 from ngpb4py.container import ContainerBackend, ExecutionResult
 
+_CWD_RELATIVE_INPUTS = MappingProxyType(
+    {
+        "filetype": "pdb",
+        "filename": "molecule.pdb",
+        "radius_file": "radius.siz",
+        "charge_file": "charge.crg",
+    }
+)
+
 
 def make_empty_config() -> NgpbConfig:
     return NgpbConfig()
@@ -46,8 +57,22 @@ def install_fake_container_run(monkeypatch, *, fail: bool = False):
     return workdirs, captured_prm_files
 
 
-def test_runner_uses_unique_per_run_workdirs_and_cleans_on_success(tmp_path, monkeypatch):
-    workdirs, _ = install_fake_container_run(monkeypatch)
+@pytest.fixture
+def fake_container_run(monkeypatch):
+    return install_fake_container_run(monkeypatch)
+
+
+@pytest.fixture
+def staging_dirs(tmp_path):
+    source_dir = tmp_path / "source"
+    scratch_dir = tmp_path / "scratch"
+    source_dir.mkdir()
+    # The runner creates the scratch directory itself, so the fixture does not.
+    return source_dir, scratch_dir
+
+
+def test_runner_uses_unique_per_run_workdirs_and_cleans_on_success(tmp_path, fake_container_run):
+    workdirs, _ = fake_container_run
     runner = NgpbRunner()
     config = make_empty_config()
 
@@ -65,16 +90,13 @@ def test_runner_uses_unique_per_run_workdirs_and_cleans_on_success(tmp_path, mon
     assert result1.provenance["run_id"] == result1.run_id
 
 
-def test_runner_accepts_dict_config_and_applies_defaults(tmp_path, monkeypatch):
-    source_dir = tmp_path / "inputs"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_accepts_dict_config_and_applies_defaults(staging_dirs, fake_container_run):
+    source_dir, scratch_dir = staging_dirs
 
     pdb_path = source_dir / "molecule.pdb"
     pdb_path.write_text("ATOM\n")
 
-    _, captured_prm_files = install_fake_container_run(monkeypatch)
+    _, captured_prm_files = fake_container_run
     runner = NgpbRunner()
 
     result = runner.run(
@@ -108,8 +130,7 @@ def test_runner_keeps_workdir_on_error(tmp_path, monkeypatch):
     assert (kept_dirs[0] / "ngpb.stdout.log").exists()
 
 
-def test_runner_keeps_workdir_when_keep_files_is_true(tmp_path, monkeypatch):
-    install_fake_container_run(monkeypatch)
+def test_runner_keeps_workdir_when_keep_files_is_true(tmp_path, fake_container_run):
     runner = NgpbRunner()
 
     result = runner.run(
@@ -122,8 +143,7 @@ def test_runner_keeps_workdir_when_keep_files_is_true(tmp_path, monkeypatch):
     assert (result.workdir / "phi_surf.txt").exists()
 
 
-def test_runner_defaults_workdir_to_current_directory(tmp_path, monkeypatch):
-    install_fake_container_run(monkeypatch)
+def test_runner_defaults_workdir_to_current_directory(tmp_path, monkeypatch, fake_container_run):
     monkeypatch.chdir(tmp_path)
     runner = NgpbRunner()
 
@@ -134,8 +154,9 @@ def test_runner_defaults_workdir_to_current_directory(tmp_path, monkeypatch):
     assert result.workdir.exists()
 
 
-def test_runner_resolves_relative_workdir_from_current_directory(tmp_path, monkeypatch):
-    install_fake_container_run(monkeypatch)
+def test_runner_resolves_relative_workdir_from_current_directory(
+    tmp_path, monkeypatch, fake_container_run
+):
     monkeypatch.chdir(tmp_path)
     runner = NgpbRunner()
 
@@ -148,11 +169,8 @@ def test_runner_resolves_relative_workdir_from_current_directory(tmp_path, monke
     assert result.workdir.parent == expected_scratch_dir
 
 
-def test_runner_stages_prm_referenced_inputs_into_run_workdir(tmp_path, monkeypatch):
-    source_dir = tmp_path / "source"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_stages_prm_referenced_inputs_into_run_workdir(staging_dirs, fake_container_run):
+    source_dir, scratch_dir = staging_dirs
 
     prm_path = source_dir / "options.prm"
     pqr_path = source_dir / "molecule.pqr"
@@ -161,7 +179,7 @@ def test_runner_stages_prm_referenced_inputs_into_run_workdir(tmp_path, monkeypa
     pqr_path.write_text("ATOM\n")
     aux_path.write_text("1.0\n")
 
-    _, captured_prm_files = install_fake_container_run(monkeypatch)
+    _, captured_prm_files = fake_container_run
     runner = NgpbRunner()
     config = NgpbConfig.from_prm(str(prm_path))
 
@@ -177,16 +195,15 @@ def test_runner_stages_prm_referenced_inputs_into_run_workdir(tmp_path, monkeypa
     assert "radius_file = radius.siz" in prmfile_path.read_text()
 
 
-def test_runner_stages_packaged_defaults_when_auxiliary_paths_are_omitted(tmp_path, monkeypatch):
-    source_dir = tmp_path / "source"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_stages_packaged_defaults_when_auxiliary_paths_are_omitted(
+    staging_dirs, fake_container_run
+):
+    source_dir, scratch_dir = staging_dirs
 
     pdb_path = source_dir / "molecule.pdb"
     pdb_path.write_text("ATOM\n")
 
-    _, captured_prm_files = install_fake_container_run(monkeypatch)
+    _, captured_prm_files = fake_container_run
     runner = NgpbRunner()
     config = NgpbConfig.defaults().with_updates({"filetype": "pdb", "filename": str(pdb_path)})
 
@@ -202,18 +219,17 @@ def test_runner_stages_packaged_defaults_when_auxiliary_paths_are_omitted(tmp_pa
     assert "charge_file = charge.crg" in prmfile_path.read_text()
 
 
-def test_runner_stages_packaged_defaults_for_prm_that_omits_auxiliary_paths(tmp_path, monkeypatch):
-    source_dir = tmp_path / "source"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_stages_packaged_defaults_for_prm_that_omits_auxiliary_paths(
+    staging_dirs, fake_container_run
+):
+    source_dir, scratch_dir = staging_dirs
 
     prm_path = source_dir / "options.prm"
     pdb_path = source_dir / "molecule.pdb"
     prm_path.write_text("filetype = pdb\nfilename = molecule.pdb\n")
     pdb_path.write_text("ATOM\n")
 
-    _, captured_prm_files = install_fake_container_run(monkeypatch)
+    _, captured_prm_files = fake_container_run
     runner = NgpbRunner()
     config = NgpbConfig.from_prm(str(prm_path))
 
@@ -227,11 +243,8 @@ def test_runner_stages_packaged_defaults_for_prm_that_omits_auxiliary_paths(tmp_
     assert (result.workdir / "charge.crg").exists()
 
 
-def test_runner_raises_when_prm_referenced_input_is_missing(tmp_path):
-    source_dir = tmp_path / "source"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_raises_when_prm_referenced_input_is_missing(staging_dirs):
+    source_dir, scratch_dir = staging_dirs
 
     prm_path = source_dir / "options.prm"
     prm_path.write_text("filename = missing.pqr\n")
@@ -243,11 +256,8 @@ def test_runner_raises_when_prm_referenced_input_is_missing(tmp_path):
         runner.run(config=config, workdir=str(scratch_dir), collect_version=False)
 
 
-def test_runner_keeps_explicit_auxiliary_file_failures_strict(tmp_path):
-    source_dir = tmp_path / "source"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_keeps_explicit_auxiliary_file_failures_strict(staging_dirs):
+    source_dir, scratch_dir = staging_dirs
 
     prm_path = source_dir / "options.prm"
     pdb_path = source_dir / "molecule.pdb"
@@ -263,11 +273,10 @@ def test_runner_keeps_explicit_auxiliary_file_failures_strict(tmp_path):
         runner.run(config=config, workdir=str(scratch_dir), collect_version=False)
 
 
-def test_runner_stages_cwd_relative_inputs_without_source_prm(tmp_path, monkeypatch):
-    source_dir = tmp_path / "inputs"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_stages_cwd_relative_inputs_without_source_prm(
+    staging_dirs, monkeypatch, fake_container_run
+):
+    source_dir, scratch_dir = staging_dirs
 
     pdb_path = source_dir / "molecule.pdb"
     siz_path = source_dir / "radius.siz"
@@ -278,16 +287,9 @@ def test_runner_stages_cwd_relative_inputs_without_source_prm(tmp_path, monkeypa
 
     monkeypatch.chdir(source_dir)
 
-    _, captured_prm_files = install_fake_container_run(monkeypatch)
+    _, captured_prm_files = fake_container_run
     runner = NgpbRunner()
-    config = NgpbConfig.defaults().with_updates(
-        {
-            "filetype": "pdb",
-            "filename": "molecule.pdb",
-            "radius_file": "radius.siz",
-            "charge_file": "charge.crg",
-        }
-    )
+    config = NgpbConfig.defaults().with_updates(_CWD_RELATIVE_INPUTS)
 
     result = runner.run(
         config=config, workdir=str(scratch_dir), collect_version=False, keep_files=True
@@ -300,11 +302,10 @@ def test_runner_stages_cwd_relative_inputs_without_source_prm(tmp_path, monkeypa
     assert (result.workdir / crg_path.name).exists()
 
 
-def test_runner_prefers_explicit_auxiliary_inputs_over_packaged_defaults(tmp_path, monkeypatch):
-    source_dir = tmp_path / "inputs"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_prefers_explicit_auxiliary_inputs_over_packaged_defaults(
+    staging_dirs, monkeypatch, fake_container_run
+):
+    source_dir, scratch_dir = staging_dirs
 
     pdb_path = source_dir / "molecule.pdb"
     siz_path = source_dir / "radius.siz"
@@ -316,15 +317,7 @@ def test_runner_prefers_explicit_auxiliary_inputs_over_packaged_defaults(tmp_pat
     monkeypatch.chdir(source_dir)
 
     runner = NgpbRunner()
-    install_fake_container_run(monkeypatch)
-    config = NgpbConfig.defaults().with_updates(
-        {
-            "filetype": "pdb",
-            "filename": "molecule.pdb",
-            "radius_file": "radius.siz",
-            "charge_file": "charge.crg",
-        }
-    )
+    config = NgpbConfig.defaults().with_updates(_CWD_RELATIVE_INPUTS)
 
     result = runner.run(
         config=config, workdir=str(scratch_dir), collect_version=False, keep_files=True
@@ -334,18 +327,15 @@ def test_runner_prefers_explicit_auxiliary_inputs_over_packaged_defaults(tmp_pat
     assert (result.workdir / "charge.crg").read_text() == "custom charge\n"
 
 
-def test_runner_ignores_output_only_prm_paths(tmp_path, monkeypatch):
-    source_dir = tmp_path / "source"
-    scratch_dir = tmp_path / "scratch"
-    source_dir.mkdir()
-    scratch_dir.mkdir()
+def test_runner_ignores_output_only_prm_paths(staging_dirs, fake_container_run):
+    source_dir, scratch_dir = staging_dirs
 
     prm_path = source_dir / "options.prm"
     pdb_path = source_dir / "molecule.pdb"
     prm_path.write_text("filetype = pdb\nfilename = molecule.pdb\nname_pqr = missing_output.pqr\n")
     pdb_path.write_text("ATOM\n")
 
-    _, captured_prm_files = install_fake_container_run(monkeypatch)
+    _, captured_prm_files = fake_container_run
     runner = NgpbRunner()
     config = NgpbConfig.from_prm(str(prm_path))
 
@@ -357,44 +347,87 @@ def test_runner_ignores_output_only_prm_paths(tmp_path, monkeypatch):
     assert not (prmfile_path.parent / "missing_output.pqr").exists()
 
 
-def test_runner_verbose_override_updates_existing_handler_level(monkeypatch):
+def test_runner_verbose_override_updates_existing_handler_level(tmp_path, fake_container_run):
     from ngpb4py import verbose
 
+    saved_handlers = verbose._LOGGER.handlers[:]
     verbose._LOGGER.handlers.clear()
-    install_fake_container_run(monkeypatch)
+    try:
+        runner = NgpbRunner(verbosity=0)
+        runner.run(config=make_empty_config(), workdir=str(tmp_path), collect_version=False)
+        assert verbose._LOGGER.handlers[0].level == verbose.logging.WARNING
+
+        runner.run(
+            config=make_empty_config(), workdir=str(tmp_path), collect_version=False, verbose=3
+        )
+        assert verbose._LOGGER.handlers[0].level == verbose.logging.DEBUG
+    finally:
+        verbose._LOGGER.handlers[:] = saved_handlers
+
+
+def test_runner_warns_when_pqr_filename_missing(tmp_path, fake_container_run):
+    records = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    logger = logging.getLogger("ngpb4py")
+    handler = RecordingHandler(level=logging.WARNING)
+    logger.addHandler(handler)
+    try:
+        runner = NgpbRunner()
+        runner.run(
+            config=NgpbConfig(data={"filetype": "pqr"}),
+            workdir=str(tmp_path),
+            collect_version=False,
+        )
+    finally:
+        logger.removeHandler(handler)
 
-    runner = NgpbRunner(verbosity=0)
-    runner.run(config=make_empty_config(), workdir="/tmp", collect_version=False)
-    assert verbose._LOGGER.handlers[0].level == verbose.logging.WARNING
+    assert any("No PQR file provided" in record.getMessage() for record in records)
 
-    runner.run(config=make_empty_config(), workdir="/tmp", collect_version=False, verbose=3)
-    assert verbose._LOGGER.handlers[0].level == verbose.logging.DEBUG
 
+def test_runner_forwards_container_settings_to_backend(tmp_path, monkeypatch, fake_container_run):
+    captured = {}
 
-def test_runner_passes_custom_apptainer_path_to_container_backend():
-    custom_path = "/opt/apptainer/bin/apptainer"
-    runner = NgpbRunner(apptainer_path=custom_path)
+    def capture_backend(**kwargs):
+        captured.update(kwargs)
+        return ContainerBackend(**kwargs)
 
-    backend = ContainerBackend(
-        image=runner.container_image,
-        apptainer_path=runner.apptainer_path,
-        extra_args=runner.container_extra_args,
-        exec_args=runner.container_exec_args,
+    monkeypatch.setattr("ngpb4py.runner.ContainerBackend", capture_backend)
+    runner = NgpbRunner(
+        container_image="/tmp/custom-nextgenpb.sif",
+        apptainer_path="/opt/apptainer/bin/apptainer",
+        container_extra_args=["--debug"],
+        container_exec_args=["--nv"],
     )
 
-    assert isinstance(backend, ContainerBackend)
-    assert backend.apptainer_path == custom_path
+    runner.run(config=make_empty_config(), workdir=str(tmp_path), collect_version=False)
 
+    assert captured == {
+        "image": "/tmp/custom-nextgenpb.sif",
+        "apptainer_path": "/opt/apptainer/bin/apptainer",
+        "extra_args": ["--debug"],
+        "exec_args": ["--nv"],
+    }
 
-def test_runner_passes_custom_sif_to_container_backend():
-    sif_path = "/tmp/custom-nextgenpb.sif"
-    runner = NgpbRunner(container_image=sif_path)
 
-    backend = ContainerBackend(
-        image=runner.container_image,
-        apptainer_path=runner.apptainer_path,
-        extra_args=runner.container_extra_args,
-        exec_args=runner.container_exec_args,
-    )
+def test_runner_rebuilds_backend_when_container_settings_change(
+    tmp_path, monkeypatch, fake_container_run
+):
+    images = []
+
+    def capture_backend(**kwargs):
+        images.append(kwargs["image"])
+        return ContainerBackend(**kwargs)
+
+    monkeypatch.setattr("ngpb4py.runner.ContainerBackend", capture_backend)
+    runner = NgpbRunner(container_image="/tmp/first.sif")
+
+    runner.run(config=make_empty_config(), workdir=str(tmp_path), collect_version=False)
+    runner.run(config=make_empty_config(), workdir=str(tmp_path), collect_version=False)
+    runner.container_image = "/tmp/second.sif"
+    runner.run(config=make_empty_config(), workdir=str(tmp_path), collect_version=False)
 
-    assert backend.image == sif_path
+    assert images == ["/tmp/first.sif", "/tmp/second.sif"]